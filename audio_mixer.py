@@ -3,12 +3,102 @@ Audio mixing utilities – background music and volume adjustment.
 Adapted from devotion_tts (https://github.com/viaifoundation/devotion_tts).
 """
 
+import functools
+import json
 import os
 import random
 from typing import Optional
 
 from pydub import AudioSegment
 
+try:
+    import numpy as np
+except ImportError:  # optional; pydub handles gain without it
+    np = None
+
+
+def _apply_gain(seg: AudioSegment, db: float) -> AudioSegment:
+    """Apply gain via one vectorized int16 pass when numpy is available.
+
+    Fixed-point multiply (Q15) with saturating clip over the whole buffer;
+    falls back to pydub's audioop path for non-16-bit audio or without numpy.
+    """
+    if db == 0:
+        return seg
+    if np is None or seg.sample_width != 2:
+        return seg.apply_gain(db)
+    factor = int(10 ** (db / 20) * (1 << 15))
+    # int64 intermediate: int32 wraps for gains above ~6 dB (factor > 1 << 16),
+    # flipping full-scale samples to the opposite rail instead of saturating
+    samples = np.frombuffer(seg._data, np.int16).astype(np.int64)
+    samples = (samples * factor) >> 15
+    np.clip(samples, -32768, 32767, out=samples)
+    return seg._spawn(samples.astype(np.int16).tobytes())
+
+
+@functools.lru_cache(maxsize=8)
+def _bgm_files(bgm_dir: str, mtime_ns: int) -> tuple[str, ...]:
+    """Track filenames in a BGM dir, cached per (dir, mtime).
+
+    Batch runs hit the same directory hundreds of times; the mtime key keeps
+    the cache honest if tracks are added mid-run.
+    """
+    with os.scandir(bgm_dir) as it:
+        return tuple(sorted(
+            e.name for e in it
+            if e.is_file() and e.name.lower().endswith((".mp3", ".wav", ".m4a"))
+        ))
+
+
+# Pre-normalized PCM published by a parent process (e.g. through
+# multiprocessing shared memory); consulted before the decode cache so
+# pool workers never re-decode tracks the parent already prepared.
+_SEEDED_BGM: dict[str, AudioSegment] = {}
+
+
+def seed_bgm(path: str, raw, frame_rate: int, channels: int, sample_width: int) -> None:
+    """Register already-normalized PCM for path; raw may be any buffer
+    (bytes, memoryview over shared memory, ...)."""
+    _SEEDED_BGM[path] = AudioSegment(
+        data=raw, sample_width=sample_width, frame_rate=frame_rate, channels=channels
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _decode_and_normalize(path: str) -> AudioSegment:
+    seg = AudioSegment.from_file(path)
+    return _apply_gain(seg, _normalize_gain(path, seg))
+
+
+def _load_and_normalize(path: str) -> AudioSegment:
+    """Normalized BGM for path: seeded PCM if published, else decode + cache.
+
+    Batch generation mixes the same few BGM tracks into every day's output;
+    caching amortizes the ffmpeg decode + RMS + gain passes to once per file.
+    """
+    seeded = _SEEDED_BGM.get(path)
+    return seeded if seeded is not None else _decode_and_normalize(path)
+
+
+def preload_bgm(bgm_dir: str = "assets/bgm") -> None:
+    """Warm the decoded-BGM cache for every track in bgm_dir.
+
+    Meant for pool-worker initializers: each worker decodes the track set
+    once up front instead of lazily on its first mixed day.
+    """
+    try:
+        files = _bgm_files(bgm_dir, os.stat(bgm_dir).st_mtime_ns)
+    except OSError:
+        return
+    for name in files:
+        path = os.path.join(bgm_dir, name)
+        if path in _SEEDED_BGM:
+            continue
+        try:
+            _decode_and_normalize(path)
+        except Exception as e:
+            print(f"❌ Error loading BGM {name}: {e}")
+
 
 def mix_bgm(
     speech_audio: AudioSegment,
@@ -43,7 +133,7 @@ def mix_bgm(
         return _apply_speech_volume(speech_audio, speech_volume_db)
 
     # Get track list
-    files = [f for f in os.listdir(bgm_dir) if f.lower().endswith((".mp3", ".wav", ".m4a"))]
+    files = list(_bgm_files(bgm_dir, os.stat(bgm_dir).st_mtime_ns))
     if not files:
         print(f"⚠️ No music files in {bgm_dir}. Skipping BGM.")
         return _apply_speech_volume(speech_audio, speech_volume_db)
@@ -58,22 +148,36 @@ def mix_bgm(
     speech = _apply_speech_volume(speech_audio, speech_volume_db)
     total_len = intro_delay_ms + len(speech) + tail_delay_ms
 
-    # Build BGM by concatenating tracks: rotate through (random order), loop when exhausted
-    bgm = AudioSegment.empty()
+    # Build BGM by concatenating tracks: rotate through (random order), loop when
+    # exhausted. Collect raw frames up to exactly the needed length instead of
+    # AudioSegment += (which re-copies the accumulated buffer) plus an oversized
+    # final track sliced mostly away.
+    frame_width = speech.frame_width
+    need = int(speech.frame_rate * total_len / 1000) * frame_width
+    chunks: list[bytes] = []
+    have = 0
     idx = 0
-    while len(bgm) < total_len:
+    while have < need:
         fname = files[idx % len(files)]
         idx += 1
         path = os.path.join(bgm_dir, fname)
         try:
-            seg = AudioSegment.from_file(path)
+            seg = _load_and_normalize(path)
         except Exception as e:
             print(f"❌ Error loading BGM {fname}: {e}")
             continue
-        seg = _normalize_bgm(seg)
-        bgm += seg
-    bgm = bgm[:total_len]
-    bgm = bgm + volume_db
+        if (seg.frame_rate, seg.channels, seg.sample_width) != (
+            speech.frame_rate, speech.channels, speech.sample_width
+        ):
+            seg = (seg.set_frame_rate(speech.frame_rate)
+                      .set_channels(speech.channels)
+                      .set_sample_width(speech.sample_width))
+        data = seg._data
+        take = min(len(data) - len(data) % frame_width, need - have)
+        chunks.append(data[:take])
+        have += take
+    bgm = speech._spawn(b"".join(chunks))
+    bgm = _apply_gain(bgm, volume_db)
 
     n_tracks = idx
     extra = f" (+{n_tracks - 1} more)" if n_tracks > 1 else ""
@@ -87,16 +191,37 @@ def mix_bgm(
     return final_mix
 
 
-def _normalize_bgm(audio: AudioSegment, target_dBFS: float = -18.0) -> AudioSegment:
-    """Normalize BGM to target RMS so rotated tracks have consistent volume."""
+def _normalize_gain(path: str, audio: AudioSegment, target_dBFS: float = -18.0) -> float:
+    """Gain (dB) that normalizes a BGM file to target RMS, cached in a sidecar.
+
+    The RMS scan walks the entire decoded buffer but is deterministic per
+    file, so the result is persisted to `<bgm>.gain.json` (keyed on mtime)
+    and read back on later runs instead of being recomputed.
+    """
+    sidecar = path + ".gain.json"
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        mtime = None
+    try:
+        with open(sidecar) as fh:
+            cached = json.load(fh)
+        if mtime is not None and cached.get("mtime") == mtime:
+            return cached["gain"]
+    except (OSError, ValueError):
+        pass
     if audio.dBFS == float("-inf"):
-        return audio  # silence
-    change_db = target_dBFS - audio.dBFS
-    return audio.apply_gain(change_db)
+        return 0.0  # silence
+    gain = target_dBFS - audio.dBFS
+    if mtime is not None:
+        try:
+            with open(sidecar, "w") as fh:
+                json.dump({"mtime": mtime, "gain": gain}, fh)
+        except OSError:
+            pass  # read-only assets dir; normalization still works uncached
+    return gain
 
 
 def _apply_speech_volume(audio: AudioSegment, volume_db: int) -> AudioSegment:
     """Apply volume adjustment to speech. 0 = no change."""
-    if volume_db == 0:
-        return audio
-    return audio + volume_db
+    return _apply_gain(audio, volume_db)
@@ -5,8 +5,24 @@ Maps book names to 1-66 (Genesis=1 ... Revelation=66).
 Outputs chapter lists as "book:chapter" for concat_daily.py.
 """
 
+import functools
+import json
 import re
 
+try:
+    import orjson
+except ImportError:  # optional; stdlib json covers the same plan IO
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # optional; entry streaming falls back to a full load
+    ijson = None
+
+
+def _loads(data: bytes | str) -> dict:
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
 # Chinese book names (Simplified), index 1-66
 BOOK_CHINESE = (
     "", "创世记", "出埃及记", "利未记", "民数记", "申命记", "约书亚记", "士师记",
@@ -125,17 +141,53 @@ BOOK_INDEX.update({
 })
 
 # Sort by length descending for longest-match
-_SORTED_NAMES = sorted(BOOK_INDEX.keys(), key=len, reverse=True)
+_SORTED_NAMES = tuple(sorted(BOOK_INDEX.keys(), key=len, reverse=True))
+# Single compiled alternation (longest name first, so the regex engine picks the
+# longest match) instead of ~200 startswith calls per lookup.
+_BOOK_RE = re.compile("(" + "|".join(re.escape(n) for n in _SORTED_NAMES) + ")", re.I)
+_BOOK_INDEX_CI = {name.lower(): num for name, num in BOOK_INDEX.items()}
+
+# Aho-Corasick DFA over the (static) book-name set: longest-prefix match with
+# no Python-level scanning. Optional; the compiled regex above is the fallback.
+try:
+    import ahocorasick_rs as _ahocorasick
+
+    _BOOK_AC = _ahocorasick.AhoCorasick(
+        [name.lower() for name in _SORTED_NAMES],
+        matchkind=_ahocorasick.MatchKind.LeftmostLongest,
+        implementation=_ahocorasick.Implementation.DFA,
+    )
+except ImportError:
+    _BOOK_AC = None
+
+# Hot-path patterns for parse_ref / parse_day_text, compiled once
+_SPLIT_REFS = re.compile(r"[,;]| and ", re.I)
+_CHAPTER_RE = re.compile(r"(\d+)(?:\s*[-–]\s*(\d+))?(?::\d+(?:-\d+)?)?")
+_SPLIT_BLOCKS = re.compile(r"\s*;\s*")
+# en-dash / em-dash -> hyphen in a single C-level pass
+_DASH_TRANS = str.maketrans({"–": "-", "—": "-"})
 
 
 def _find_book(s: str) -> tuple[int | None, str]:
     """Find first book name in s. Return (book_num, remainder)."""
     s = s.strip()
-    for name in _SORTED_NAMES:
-        if s.startswith(name) or s.lower().startswith(name.lower()):
-            rest = s[len(name):].strip()
-            return BOOK_INDEX[name], rest
-    return None, s
+    if _BOOK_AC is not None:
+        matches = _BOOK_AC.find_matches_as_indexes(s.lower())
+        # leftmost-longest: if anything matched at position 0 it is first
+        if not matches or matches[0][1] != 0:
+            return None, s
+        idx, _, end = matches[0]
+        return _BOOK_INDEX_CI[_SORTED_NAMES[idx].lower()], s[end:].strip()
+    m = _BOOK_RE.match(s)
+    if m is None:
+        return None, s
+    return _BOOK_INDEX_CI[m.group(1).lower()], s[m.end():].strip()
+
+
+def _parse_ref(s: str) -> tuple[int, int]:
+    """Parse 'book:chapter' by slicing at the colon (no str.split list)."""
+    p = s.index(":")
+    return int(s[:p]), int(s[p + 1:])
 
 
 def _chapters_to_str(
@@ -145,39 +197,54 @@ def _chapters_to_str(
     if not chapters:
         return ""
     sp = " " if space_before_ch else ""
+    # Parse each "book:chapter" once; runs are grown on strict +1 adjacency so
+    # each run is contiguous by construction (no range check needed).
+    pairs = [_parse_ref(c) for c in chapters]
     parts = []
     i = 0
-    while i < len(chapters):
-        book_ch, ch_num = chapters[i].split(":")
-        book_num = int(book_ch)
-        ch_nums = [int(ch_num)]
-        j = i + 1
-        while j < len(chapters):
-            b, c = chapters[j].split(":")
-            if int(b) == book_num and int(c) == ch_nums[-1] + 1:
-                ch_nums.append(int(c))
-                j += 1
-            else:
-                break
-        i = j
+    n = len(pairs)
+    while i < n:
+        book_num, first = pairs[i]
+        last = first
+        i += 1
+        while i < n and pairs[i] == (book_num, last + 1):
+            last += 1
+            i += 1
         name = book_names[book_num] if book_num < len(book_names) else str(book_num)
-        if len(ch_nums) == 1:
-            parts.append(f"{name}{sp}{ch_nums[0]}")
-        elif ch_nums == list(range(ch_nums[0], ch_nums[-1] + 1)):
-            parts.append(f"{name}{sp}{ch_nums[0]}-{ch_nums[-1]}")
+        if first == last:
+            parts.append(f"{name}{sp}{first}")
         else:
-            parts.append(f"{name}{sp}" + joiner.join(str(c) for c in ch_nums))
+            parts.append(f"{name}{sp}{first}-{last}")
     return sep.join(parts)
 
 
+# Formatting presets per language tag, for the memoized formatter below
+_LANG_FORMATS = {
+    "cn": (BOOK_CHINESE, "；", "、", False),
+    "tw": (BOOK_CHINESE_TW, "；", "、", False),
+    "en": (BOOK_ENGLISH, "; ", ", ", True),
+}
+
+
+@functools.lru_cache(maxsize=512)
+def _chapters_to_str_cached(chapters: tuple, lang: str) -> str:
+    """Memoized formatter; plans repeat day layouts across runs and languages."""
+    book_names, sep, joiner, sp = _LANG_FORMATS[lang]
+    return _chapters_to_str(chapters, book_names, sep, joiner, space_before_ch=sp)
+
+
 def chapters_to_chinese(chapters: list[str], book_names: tuple = BOOK_CHINESE) -> str:
     """Convert ['1:1','1:2','1:3'] -> '创世记1-3' (or Traditional with book_names=BOOK_CHINESE_TW)."""
+    if book_names is BOOK_CHINESE_TW:
+        return _chapters_to_str_cached(tuple(chapters), "tw")
+    if book_names is BOOK_CHINESE:
+        return _chapters_to_str_cached(tuple(chapters), "cn")
     return _chapters_to_str(chapters, book_names, "；", "、", space_before_ch=False)
 
 
 def chapters_to_english(chapters: list[str]) -> str:
     """Convert ['1:1','1:2','1:3'] -> 'Genesis 1-3' (ESV book names)."""
-    return _chapters_to_str(chapters, BOOK_ENGLISH, "; ", ", ", space_before_ch=True)
+    return _chapters_to_str_cached(tuple(chapters), "en")
 
 
 def parse_ref(text: str) -> list[tuple[int, int]]:
@@ -187,7 +254,7 @@ def parse_ref(text: str) -> list[tuple[int, int]]:
     """
     result = []
     # Split by ; or , for multiple refs
-    parts = re.split(r"[,;]| and ", text, flags=re.I)
+    parts = _SPLIT_REFS.split(text)
     for part in parts:
         part = part.strip()
         if not part:
@@ -202,7 +269,7 @@ def parse_ref(text: str) -> list[tuple[int, int]]:
             result.append((book, 1))
             continue
         # Match chapter or chapter:verse
-        m = re.match(r"(\d+)(?:\s*[-–]\s*(\d+))?(?::\d+(?:-\d+)?)?", rest)
+        m = _CHAPTER_RE.match(rest)
         if m:
             start = int(m.group(1))
             end = int(m.group(2)) if m.group(2) else start
@@ -220,9 +287,9 @@ def parse_day_text(text: str) -> list[str]:
     out = []
     # Split by semicolon or ";" for multiple refs; some use ";" others ","
     # Also handle "Genesis 1–3" (en-dash)
-    text = text.replace("–", "-").replace("—", "-")
+    text = text.translate(_DASH_TRANS)
     # Split on semicolons first; each segment may have "Book X-Y"
-    for block in re.split(r"\s*;\s*", text):
+    for block in _SPLIT_BLOCKS.split(text):
         block = block.strip()
         if not block:
             continue
@@ -295,37 +362,94 @@ def chapters_to_filename(
         abbr = BOOK_FILENAME_ABBR
     if not chapters:
         return "nodata"
+    # Same single-pass run merge as _chapters_to_str: parse each entry once,
+    # grow runs on strict +1 adjacency.
+    pairs = [_parse_ref(c) for c in chapters]
     parts = []
     i = 0
-    while i < len(chapters):
-        book_num = int(chapters[i].split(":")[0])
-        ch_num = int(chapters[i].split(":")[1])
-        ch_nums = [ch_num]
-        j = i + 1
-        while j < len(chapters):
-            b, c = chapters[j].split(":")
-            if int(b) == book_num and int(c) == ch_nums[-1] + 1:
-                ch_nums.append(int(c))
-                j += 1
-            else:
-                break
-        i = j
+    n = len(pairs)
+    while i < n:
+        book_num, first = pairs[i]
+        last = first
+        i += 1
+        while i < n and pairs[i] == (book_num, last + 1):
+            last += 1
+            i += 1
         book_abbr = abbr.get(book_num, f"b{book_num}")
-        if len(ch_nums) == 1:
-            parts.append(f"{book_abbr}{ch_nums[0]}")
+        if first == last:
+            parts.append(f"{book_abbr}{first}")
         else:
-            parts.append(f"{book_abbr}{ch_nums[0]}-{ch_nums[-1]}")
+            parts.append(f"{book_abbr}{first}-{last}")
     return between_groups.join(parts)
 
 
+def legacy_strs(entry: dict) -> list[str]:
+    """Chapters of a plan entry as legacy "book:chapter" strings."""
+    if "books" in entry:
+        return [f"{b}:{c}" for b, c in zip(entry["books"], entry["chapters"])]
+    return entry.get("chapters", [])
+
+
 def load_plan(path: Path) -> dict:
-    """Load plan JSON. Returns {id, name, days, source, entries: [[chapters]]}."""
-    import json
-    return json.loads(path.read_text())
+    """Load plan JSON. Returns {id, name, days, source, entries: [[chapters]]}.
+
+    Entries saved in the compact parallel-array form ({"books": [...],
+    "chapters": [...]}) are normalized back to "book:chapter" strings here so
+    every consumer sees one shape.
+    """
+    plan = _loads(path.read_bytes())
+    for entry in plan.get("entries", []):
+        if isinstance(entry, dict) and "books" in entry:
+            entry["chapters"] = legacy_strs(entry)
+            del entry["books"]
+    return plan
 
 
-def save_plan(plan: dict, path: Path) -> None:
-    """Save plan JSON."""
-    import json
+def iter_plan_entries(path: Path):
+    """Yield a plan's entries one at a time, in file order.
+
+    With ijson installed, entries stream off disk so only one is in memory
+    at a time — callers iterating a day range can break early and never
+    parse the rest of the file (entries are day-sorted). Falls back to a
+    full load_plan without ijson. Entries are normalized the same way as
+    load_plan.
+    """
+    if ijson is None:
+        yield from load_plan(path).get("entries", [])
+        return
+    with path.open("rb") as f:
+        for entry in ijson.items(f, "entries.item"):
+            if isinstance(entry, dict) and "books" in entry:
+                entry["chapters"] = legacy_strs(entry)
+                del entry["books"]
+            yield entry
+
+
+def save_plan(plan: dict, path: Path, soa: bool = False) -> None:
+    """Save plan JSON.
+
+    With soa=True, per-day chapters are written as parallel int arrays
+    ({"books": [...], "chapters": [...]}) instead of "book:chapter" strings —
+    smaller on disk and parsed without per-entry splitting. load_plan reads
+    either form.
+    """
+    if soa:
+        plan = dict(plan)
+        entries = []
+        for entry in plan.get("entries", []):
+            chs = entry.get("chapters", [])
+            if chs and isinstance(chs[0], str):
+                entry = dict(entry)
+                pairs = [_parse_ref(ch) for ch in chs]
+                entry["books"] = [b for b, _ in pairs]
+                entry["chapters"] = [c for _, c in pairs]
+            entries.append(entry)
+        plan["entries"] = entries
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(plan, indent=2, ensure_ascii=False))
+    if orjson is not None:
+        # orjson always emits UTF-8 (ensure_ascii=False equivalent)
+        path.write_bytes(orjson.dumps(plan, option=orjson.OPT_INDENT_2))
+    else:
+        # json.dump streams to the file instead of building one giant string
+        with path.open("w", encoding="utf-8") as fp:
+            json.dump(plan, fp, indent=2, ensure_ascii=False)
@@ -16,13 +16,16 @@ Requires: pydub, ffmpeg (for pydub mp3 support), edge-tts (for TTS generation).
 """
 
 import argparse
+import functools
+import os
 import random
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import subprocess
-import tempfile
 import json
+import tempfile
 from pydub import AudioSegment
 
 # Import from repo root
@@ -47,35 +50,269 @@ TRANSLATION_COLUMNS: dict[str, str] = {
 }
 
 
-def _speedup_ffmpeg(seg: AudioSegment, speed: float) -> AudioSegment:
-    """Speed up using ffmpeg atempo (preserves pitch). Chains atempo for speed > 2."""
-    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-        tmp_in = f.name
-    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-        tmp_out = f.name
+# PCM format the ffmpeg filtergraph renders to (matches the Everest masters)
+_PCM_RATE = 44100
+_PCM_CHANNELS = 2
+_PCM_WIDTH = 2
+
+_EXPORT_BITRATE = "320k"
+
+# Shared zero buffer for gap silence. Gaps are needed once per segment per day
+# (hundreds of times in --batch runs); slicing one preallocated buffer avoids
+# reallocating zeros each call. Grown on demand if a gap ever outsizes it.
+_ZERO = bytes(1 << 20)
+
+
+def _silence_bytes(n: int) -> bytes:
+    """n bytes of silence, sliced from the shared zero buffer."""
+    global _ZERO
+    if n > len(_ZERO):
+        _ZERO = bytes(n)
+    return _ZERO[:n]
+
+
+# Sample-rate tables for the MPEG audio frame header, keyed by version bits
+# (11=MPEG1, 10=MPEG2, 00=MPEG2.5; 01 is reserved).
+_MP3_RATES = {
+    3: (44100, 48000, 32000),
+    2: (22050, 24000, 16000),
+    0: (11025, 12000, 8000),
+}
+
+
+def _mp3_format(path: Path) -> tuple[int, int] | None:
+    """(sample_rate, channels) from the first MPEG frame header, or None.
+
+    Reads a few KB at most — cheap enough to probe every chapter before
+    choosing the stream-copy path, where mixing formats would corrupt the
+    output (the concat demuxer copies frames without resampling).
+    """
+    try:
+        with open(path, "rb") as f:
+            head = f.read(10)
+            if head[:3] == b"ID3":  # skip the ID3v2 tag (synchsafe size)
+                f.seek((head[6] & 0x7F) << 21 | (head[7] & 0x7F) << 14
+                       | (head[8] & 0x7F) << 7 | (head[9] & 0x7F), 1)
+            data = f.read(4096)
+    except OSError:
+        return None
+    for i in range(len(data) - 3):
+        if data[i] != 0xFF or data[i + 1] & 0xE0 != 0xE0:
+            continue
+        version = (data[i + 1] >> 3) & 0x3
+        rate_idx = (data[i + 2] >> 2) & 0x3
+        if version == 1 or rate_idx == 3:
+            continue  # reserved values: sync was a false positive
+        channels = 1 if (data[i + 3] >> 6) & 0x3 == 3 else 2
+        return _MP3_RATES[version][rate_idx], channels
+    return None
+
+
+def _silence_mp3(gap_ms: int, rate: int, channels: int) -> Path | None:
+    """Encode (once) and cache a silence MP3 matching the chapters' format.
+
+    Encodes to a unique temp file and renames onto the cache path: the cache
+    is shared across pool workers, and a sibling passing the exists() check
+    mid-encode would concat a truncated gap into its output.
+    """
+    path = Path(tempfile.gettempdir()) / f"ting_gap_{gap_ms}ms_{rate}hz{channels}ch.mp3"
+    if path.exists():
+        return path
+    # MPEG-2 (rates below 32 kHz, e.g. 24 kHz edge-tts output) caps at 160 kbps
+    bitrate = _EXPORT_BITRATE if rate >= 32000 else "160k"
+    expr = "|".join(["0"] * channels)
+    tmp = path.with_suffix(f".tmp{os.getpid()}.mp3")
+    try:
+        subprocess.run(
+            [
+                "ffmpeg", "-y", "-v", "error",
+                "-f", "lavfi", "-i", f"aevalsrc={expr}:s={rate}:d={gap_ms / 1000}",
+                "-b:a", bitrate, str(tmp),
+            ],
+            capture_output=True, check=True,
+        )
+        os.replace(tmp, path)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    finally:
+        tmp.unlink(missing_ok=True)
+    return path
+
+
+def _concat_copy(paths: list[Path], gap_ms: int, output_path: Path) -> bool:
+    """
+    Concatenate MP3s without re-encoding, via ffmpeg's concat demuxer.
+
+    Only valid when no gain/speed/BGM processing is requested and all inputs
+    share one sample rate and channel layout (the demuxer never resamples, so
+    e.g. mixing 24 kHz mono TTS with 44.1 kHz stereo Everest would corrupt
+    the output): the chapter frames are copied bit-exact into the output,
+    skipping the decode and the 320k re-encode entirely. Gaps are spliced in
+    from a cached silence MP3 encoded at the chapters' format.
+
+    Returns False on failure or format mismatch so the caller can fall back
+    to the decode path.
+    """
+    formats = {_mp3_format(p) for p in paths}
+    if len(formats) != 1 or None in formats:
+        return False
+    rate, channels = formats.pop()
+    entries = [str(p) for p in paths]
+    if gap_ms > 0 and len(entries) > 1:
+        gap = _silence_mp3(gap_ms, rate, channels)
+        if gap is None:
+            return False
+        with_gaps: list[str] = []
+        for p in entries:
+            with_gaps.append(p)
+            with_gaps.append(str(gap))
+        entries = with_gaps[:-1]
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as fh:
+        fh.writelines(f"file '{p}'\n" for p in entries)
+        list_path = fh.name
     try:
-        seg.export(tmp_in, format="wav")
-        # atempo accepts 0.5–2.0; chain for higher speeds (e.g. 3x = atempo=2,atempo=1.5)
-        parts = []
-        r = speed
-        while r > 2.0:
-            parts.append("atempo=2")
-            r /= 2.0
-        if r > 1.0:
-            parts.append(f"atempo={r}")
-        filter_str = ",".join(parts) if parts else "atempo=1"
         subprocess.run(
-            ["ffmpeg", "-y", "-i", tmp_in, "-filter:a", filter_str, tmp_out],
-            check=True, capture_output=True
+            [
+                "ffmpeg", "-y", "-v", "error",
+                "-f", "concat", "-safe", "0", "-i", list_path,
+                "-c", "copy", str(output_path),
+            ],
+            capture_output=True, check=True,
         )
-        return AudioSegment.from_wav(tmp_out)
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"⚠️ Stream-copy concat failed ({e}); falling back to re-encode")
+        return False
     finally:
-        Path(tmp_in).unlink(missing_ok=True)
-        Path(tmp_out).unlink(missing_ok=True)
+        os.unlink(list_path)
+    return True
+
 
+def _atempo_chain(speed: float) -> list[str]:
+    """atempo accepts 0.5–2.0; chain for higher speeds (e.g. 3x = atempo=2,atempo=1.5)."""
+    parts = []
+    r = speed
+    while r > 2.0:
+        parts.append("atempo=2")
+        r /= 2.0
+    if r > 1.0:
+        parts.append(f"atempo={r}")
+    return parts
 
-def _load_mp3(path: Path, max_retries: int = 2) -> AudioSegment:
-    """Load MP3 with retry for intermittent ffprobe JSONDecodeError."""
+
+def _speedup_ffmpeg(seg: AudioSegment, speed: float) -> AudioSegment:
+    """Speed up using ffmpeg atempo (preserves pitch). Chains atempo for speed > 2.
+
+    Raw PCM goes over stdin/stdout pipes, so no WAV temp files hit the disk.
+    """
+    parts = _atempo_chain(speed)
+    filter_str = ",".join(parts) if parts else "atempo=1"
+    pcm_fmt = f"s{seg.sample_width * 8}le"
+    proc = subprocess.run(
+        [
+            "ffmpeg", "-v", "error",
+            "-f", pcm_fmt, "-ar", str(seg.frame_rate), "-ac", str(seg.channels),
+            "-i", "pipe:0",
+            "-filter:a", filter_str,
+            "-f", pcm_fmt, "-ar", str(seg.frame_rate), "-ac", str(seg.channels),
+            "pipe:1",
+        ],
+        input=seg.raw_data, capture_output=True, check=True,
+    )
+    out = proc.stdout
+    return seg._spawn(out[: len(out) - len(out) % seg.frame_width])
+
+
+def _assemble_ffmpeg(
+    playlist: list[tuple[Path, float, bool]], gap_ms: int, speed: float
+) -> AudioSegment | None:
+    """
+    Decode, gain-adjust, gap and concatenate all playlist entries with a single
+    ffmpeg filtergraph, streaming s16 PCM back over a pipe. One fork/exec and no
+    Python-side buffer shuffling, instead of one ffmpeg round-trip per stage.
+
+    Returns None on failure so the caller can fall back to the pydub path.
+    """
+    cmd = ["ffmpeg", "-v", "error"]
+    filters: list[str] = []
+    labels: list[str] = []
+    fmt = f"aformat=sample_fmts=s16:sample_rates={_PCM_RATE}:channel_layouts=stereo"
+    for i, (path, gain_db, apply_speed) in enumerate(playlist):
+        cmd.extend(["-i", str(path)])
+        chain = [fmt]
+        if gain_db:
+            chain.append(f"volume={gain_db}dB")
+        if apply_speed and speed > 1.0:
+            chain.extend(_atempo_chain(speed))
+        filters.append(f"[{i}:a]{','.join(chain)}[a{i}]")
+        labels.append(f"[a{i}]")
+    if gap_ms > 0 and len(labels) > 1:
+        gapped: list[str] = []
+        for i, label in enumerate(labels):
+            if i:
+                filters.append(f"aevalsrc=0|0:s={_PCM_RATE}:d={gap_ms / 1000}[g{i}]")
+                gapped.append(f"[g{i}]")
+            gapped.append(label)
+        labels = gapped
+    filters.append("".join(labels) + f"concat=n={len(labels)}:v=0:a=1[out]")
+    cmd.extend([
+        "-filter_complex", ";".join(filters), "-map", "[out]",
+        "-f", "s16le", "-ac", str(_PCM_CHANNELS), "-ar", str(_PCM_RATE), "pipe:1",
+    ])
+    try:
+        proc = subprocess.run(cmd, capture_output=True, check=True)
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"⚠️ ffmpeg filtergraph failed ({e}); falling back to per-file decode")
+        return None
+    raw = proc.stdout
+    raw = raw[: len(raw) - len(raw) % (_PCM_WIDTH * _PCM_CHANNELS)]
+    return AudioSegment(
+        data=raw, sample_width=_PCM_WIDTH, frame_rate=_PCM_RATE, channels=_PCM_CHANNELS
+    )
+
+
+def _assemble_pydub(
+    playlist: list[tuple[Path, float, bool]], gap_ms: int, speed: float
+) -> AudioSegment:
+    """Fallback: decode each entry (prefetched in parallel), then gain/speed/concat."""
+    _prefetch_chapters([path for path, _, _ in playlist])
+    pieces = []
+    for path, gain_db, apply_speed in playlist:
+        seg = _load_mp3(path)
+        if gain_db:
+            seg = seg + gain_db
+        if apply_speed and speed > 1.0:
+            seg = _speedup_ffmpeg(seg, speed)
+        pieces.append(seg)
+    return _concat_segments(pieces, gap_ms)
+
+
+@functools.lru_cache(maxsize=16)
+def _load_chapter(path: str) -> AudioSegment:
+    """Decoded-chapter cache shared across days in --batch runs.
+
+    Plans revisit chapters (and batch mode replays whole books), so cache
+    decodes process-wide. The cap stays small on purpose: a decoded stereo
+    chapter runs tens of MB.
+    """
+    return _decode_mp3(Path(path))
+
+
+def _prefetch_chapters(paths: list[Path]) -> None:
+    """Decode the given chapter MP3s concurrently before the concat loop.
+
+    Each ffmpeg decode is a separate subprocess, so threads overlap decode
+    latency; results land in the _load_chapter cache.
+    """
+    existing = [str(p) for p in dict.fromkeys(paths) if p.exists()]
+    if len(existing) < 2:
+        return
+    with ThreadPoolExecutor(max_workers=min(len(existing), os.cpu_count() or 1)) as ex:
+        for _ in ex.map(_load_chapter, existing):
+            pass
+
+
+def _decode_mp3(path: Path, max_retries: int = 2) -> AudioSegment:
+    """Decode MP3 with retry for intermittent ffprobe JSONDecodeError."""
     last_err = None
     for attempt in range(max_retries):
         try:
@@ -91,6 +328,33 @@ def _load_mp3(path: Path, max_retries: int = 2) -> AudioSegment:
     raise last_err
 
 
+def _load_mp3(path: Path) -> AudioSegment:
+    """Load MP3 through the process-wide decoded-chapter cache."""
+    return _load_chapter(str(path))
+
+
+def _concat_segments(segments: list[AudioSegment], gap_ms: int) -> AudioSegment:
+    """
+    Concatenate segments with gap_ms of silence between each.
+
+    AudioSegment.__add__ copies the whole accumulated buffer every step
+    (O(N²) in total audio length); when all segments share the same frame
+    parameters we join the raw data once instead.
+    """
+    first = segments[0]
+    params = (first.frame_rate, first.channels, first.sample_width)
+    if all((s.frame_rate, s.channels, s.sample_width) == params for s in segments):
+        gap_frames = int(first.frame_rate * gap_ms / 1000)
+        gap = _silence_bytes(gap_frames * first.frame_width)
+        return first._spawn(gap.join(seg._data for seg in segments))
+    # Mixed formats (e.g. Everest vs TTS sample rates): let pydub resample.
+    silence = AudioSegment.silent(duration=gap_ms)
+    combined = segments[0]
+    for seg in segments[1:]:
+        combined = combined + silence + seg
+    return combined
+
+
 def parse_chapters(spec: str):
     """Parse '1:1,1:2,43:16' -> [(1,1), (1,2), (43,16)]."""
     pairs = []
@@ -102,7 +366,8 @@ def parse_chapters(spec: str):
     return pairs
 
 
-def main():
+def build_parser() -> argparse.ArgumentParser:
+    """CLI parser, exposed so other scripts can call run() in-process."""
     parser = argparse.ArgumentParser(
         description="Concatenate chapter MP3s into one daily audio",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -120,7 +385,18 @@ Examples:
     )
     parser.add_argument("--chapters", "-c", type=str, help="Comma-separated book:chapter (e.g. 1:1,1:2,43:16)")
     parser.add_argument("--chapters-file", "-f", type=str, help="File with one book:chapter per line")
-    parser.add_argument("--output", "-o", type=str, required=True, help="Output MP3 path")
+    parser.add_argument(
+        "--batch",
+        type=str,
+        default=None,
+        metavar="DAYS_JSON",
+        help=(
+            'Build many days in one process: JSON {"days": [{"out": "day_001.mp3", '
+            '"chapters": ["1:1", ...]}, ...]}. Other flags apply to every day. '
+            "Decoded chapters, normalized BGM and gap silence are cached across days."
+        ),
+    )
+    parser.add_argument("--output", "-o", type=str, default=None, help="Output MP3 path (required unless --batch)")
     parser.add_argument("--chapters-dir", type=str, default=None, help="Chapters dir (default: assets/bible/audio/chapters)")
     parser.add_argument("--chapters-dir-davidyen", type=str, default=None, help="David Yen chapters dir")
     parser.add_argument(
@@ -188,22 +464,82 @@ Examples:
     # Volume & speed
     parser.add_argument("--speech-volume", type=int, default=0, help="Speech volume adjustment in dB (0 = no change)")
     parser.add_argument("--speed", type=float, default=1.0, help="Playback speed (e.g. 2.0 = 2x, must be >= 1.0)")
+    parser.add_argument(
+        "--mp3-quality",
+        type=int,
+        default=None,
+        metavar="Q",
+        help=(
+            "Encode output as LAME VBR at quality Q (0=best..9); "
+            "-q:a 4 ≈ 165kbps VBR, perceptually ≈ 192k CBR. "
+            "Default: 320k CBR as before."
+        ),
+    )
+    parser.add_argument(
+        "--mp3-compression",
+        type=int,
+        default=None,
+        metavar="N",
+        help=(
+            "ffmpeg -compression_level (LAME -q) 0=slow/best..9=fast; "
+            "5 encodes ~2x faster than the default with no audible loss on "
+            "spoken-word content. Default: encoder default."
+        ),
+    )
+    return parser
+
 
+def main():
+    parser = build_parser()
     args = parser.parse_args()
 
+    if args.batch:
+        return _run_batch(args)
+    if not args.output:
+        parser.error("--output is required (unless using --batch)")
+    if not (args.chapters or args.chapters_file):
+        parser.error("Provide --chapters, --chapters-file or --batch")
+    return run(args)
+
+
+def _run_batch(args) -> int:
+    """Build every day from a --batch JSON in one process.
+
+    Running days in a single interpreter lets the decoded-chapter cache, the
+    normalized-BGM cache and the gap-silence MP3 carry over between days
+    instead of being rebuilt per shell invocation.
+    """
+    batch = json.loads(Path(args.batch).read_text())
+    days = batch.get("days", [])
+    if not days:
+        print(f"❌ No days in batch file: {args.batch}")
+        return 1
+    rc = 0
+    for day in days:
+        day_args = argparse.Namespace(**vars(args))
+        day_args.batch = None
+        day_args.chapters = ",".join(day["chapters"])
+        day_args.chapters_file = None
+        day_args.output = day["out"]
+        print(f"📅 {day['out']}: {day_args.chapters}")
+        rc = run(day_args) or rc
+    return rc
+
+
+def run(args) -> int:
+    """Build one daily file from parsed args. Returns a process exit code."""
     # Resolve chapters
     if args.chapters_file:
         text = Path(args.chapters_file).read_text()
         lines = [l.strip() for l in text.splitlines() if l.strip()]
         spec = ",".join(lines)
-    elif args.chapters:
-        spec = args.chapters
     else:
-        parser.error("Provide --chapters or --chapters-file")
+        spec = args.chapters
 
     pairs = parse_chapters(spec)
     if not pairs:
-        parser.error("No valid chapters parsed")
+        print("❌ No valid chapters parsed")
+        return 1
 
     # Validate compare-translation names
     compare_translations: list[str] = []
@@ -239,9 +575,9 @@ Examples:
     everest_dir = repo_root / "assets" / "bible" / "audio" / "chapters"
     davidyen_dir = Path(args.chapters_dir_davidyen) if args.chapters_dir_davidyen else repo_root / "assets" / "bible" / "audio" / "chapters_davidyen"
 
-    # Load and concatenate
-    combined = AudioSegment.empty()
-    silence = AudioSegment.silent(duration=args.gap_ms)
+    # Play order is collected as (path, gain_db, apply_speed) entries and
+    # rendered in a single pass at the end
+    playlist: list[tuple[Path, float, bool]] = []
 
     # Voice rotation counter (initialized from arg to allow cross-day continuity)
     voice_rotation_idx = args.voice_rotation_start
@@ -260,11 +596,7 @@ Examples:
             # 1. Everest
             path_ev = everest_dir / fname
             if path_ev.exists():
-                seg_ev = _load_mp3(path_ev)
-                seg_ev = seg_ev + NARRATION_BOOST_EVEREST_DB
-                if args.speed > 1.0:
-                    seg_ev = _speedup_ffmpeg(seg_ev, args.speed)
-                combined += seg_ev + silence
+                playlist.append((path_ev, NARRATION_BOOST_EVEREST_DB, args.speed > 1.0))
             else:
                 print(f"⚠️ Missing Everest: {path_ev}")
 
@@ -278,7 +610,7 @@ Examples:
                 ], check=False)
 
             if path_tts.exists():
-                combined += _load_mp3(path_tts) + silence
+                playlist.append((path_tts, 0.0, False))
             else:
                 print(f"⚠️ Missing TTS (Generation failed): {path_tts}")
 
@@ -296,7 +628,7 @@ Examples:
                         "--translation", trans_name,
                     ], check=False)
                 if path_trans.exists():
-                    combined += _load_mp3(path_trans) + silence
+                    playlist.append((path_trans, 0.0, False))
                 else:
                     print(f"⚠️ Missing {trans_name} TTS (generation failed): {path_trans}")
 
@@ -304,7 +636,6 @@ Examples:
             mode = args.chapter_voice
 
             def append_primary_for_source(current_source: str) -> None:
-                nonlocal combined
                 path_ev = everest_dir / fname
                 path_dy = davidyen_dir / fname
                 if current_source == "davidyen":
@@ -327,19 +658,15 @@ Examples:
                     print(f"⚠️ Missing: {path}")
                     return
 
-                seg = _load_mp3(path)
+                gain = float(args.speech_volume)
                 if not args.use_tts and path.parent != tts_dir:
-                    base_boost = (
+                    gain += (
                         NARRATION_BOOST_DAVIDYEN_DB
                         if is_davidyen
                         else NARRATION_BOOST_EVEREST_DB
                     )
-                    seg = seg + base_boost
-                if args.speech_volume != 0:
-                    seg = seg + args.speech_volume
-                if args.speed > 1.0 and not args.use_tts and path.parent != tts_dir:
-                    seg = _speedup_ffmpeg(seg, args.speed)
-                combined += seg + silence
+                apply_speed = args.speed > 1.0 and not args.use_tts and path.parent != tts_dir
+                playlist.append((path, gain, apply_speed))
 
             # Per-chapter: one or two primary passes, then optional comparison TTS
             if mode == "male_then_female" and not args.use_tts:
@@ -384,16 +711,26 @@ Examples:
                         "--translation", trans_name,
                     ], check=False)
                 if path_trans.exists():
-                    combined += _load_mp3(path_trans) + silence
+                    playlist.append((path_trans, 0.0, False))
                 else:
                     print(f"⚠️ Missing {trans_name} TTS (generation failed): {path_trans}")
 
-    if len(combined) == 0:
+    if not playlist:
         print("❌ No chapters loaded")
         return 1
 
-    # Trim trailing silence
-    combined = combined[:-args.gap_ms] if args.gap_ms > 0 else combined
+    # Concat-only days (no BGM/gain/speed) can skip decode + re-encode entirely:
+    # copy the already-encoded MP3 frames straight through the concat demuxer.
+    if (args.mp3_quality is None and not args.bgm
+            and all(gain == 0 and not sp for _, gain, sp in playlist)):
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        if _concat_copy([p for p, _, _ in playlist], args.gap_ms, output_path):
+            print(f"✅ Saved: {output_path} (stream copy, no re-encode)")
+            return 0
+
+    combined = _assemble_ffmpeg(playlist, args.gap_ms, args.speed)
+    if combined is None:
+        combined = _assemble_pydub(playlist, args.gap_ms, args.speed)
 
     # Apply BGM or speech volume
     if args.bgm:
@@ -410,7 +747,16 @@ Examples:
         combined = combined + args.speech_volume
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    combined.export(str(output_path), format="mp3", bitrate="320k")
+    params = []
+    if args.mp3_quality is not None:
+        params += ["-q:a", str(args.mp3_quality)]
+    if args.mp3_compression is not None:
+        params += ["-compression_level", str(args.mp3_compression)]
+    if args.mp3_quality is not None:
+        combined.export(str(output_path), format="mp3", parameters=params)
+    else:
+        combined.export(str(output_path), format="mp3", bitrate="320k",
+                        parameters=params or None)
     print(f"✅ Saved: {output_path}")
     return 0
 
@@ -8,11 +8,14 @@ Requires: requests (pip install requests)
 """
 
 import argparse
+import os
 import shutil
 import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 import requests
+from requests.adapters import HTTPAdapter
 
 BASE_URL = "https://www.everestaudiobible.org/mp3/website/Everest_Audio_Bible_48k"
 
@@ -37,21 +40,113 @@ BOOK_CHAPTERS = [
 ]
 
 
+def _make_session(pool_size: int = 8) -> requests.Session:
+    """Shared keep-alive session for all book downloads.
+
+    One TLS handshake total (reused across the download pool) instead of a
+    fresh connection per book; the adapter pool is sized for the workers.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def download_book(session: requests.Session, book: int, code: str, zip_path: Path) -> Path:
+    """Download one book ZIP if missing. Returns the ZIP path; raises on failure."""
+    if zip_path.exists():
+        print(f"Book {book} ({code}): zip exists")
+        return zip_path
+    print(f"Book {book} ({code}): downloading...")
+    try:
+        r = session.get(f"{BASE_URL}/{zip_path.name}", timeout=120, stream=True)
+        r.raise_for_status()
+        # copyfileobj keeps the copy loop in C with 1 MiB reads, instead of a
+        # Python-level iter_content loop waking up every 8 KiB
+        r.raw.decode_content = True
+        with open(zip_path, "wb") as f:
+            shutil.copyfileobj(r.raw, f, length=1 << 20)
+    except requests.RequestException:
+        if zip_path.exists():
+            zip_path.unlink()
+        raise
+    return zip_path
+
+
+def _extract_one(zip_path: Path, member: str, dest: Path) -> None:
+    """Stream one archive member to dest through its own ZipFile handle.
+
+    zipfile serializes reads on a shared handle behind an internal lock, so
+    each worker reopens the archive to read its member independently.
+    """
+    with zipfile.ZipFile(zip_path, "r") as zf:
+        with zf.open(member) as src, open(dest, "wb") as dst:
+            shutil.copyfileobj(src, dst, length=1 << 20)
+
+
+def extract_book(
+    book: int,
+    code: str,
+    zip_path: Path,
+    chapters_dir: Path,
+    expect_chapters: int,
+) -> list[str]:
+    """Extract one book ZIP into chapters_dir. Returns failure tags (empty on success).
+
+    Chapter MP3s stream straight from the ZIP to their final BBB_CCC.mp3 paths,
+    so each byte is written to disk once (no temp-dir extract + copy). Members
+    are extracted in parallel; big books (Psalms, Isaiah) are read-bound.
+    """
+    try:
+        with zipfile.ZipFile(zip_path, "r") as zf:
+            mp3_infos = sorted(
+                (i for i in zf.infolist() if i.filename.lower().endswith(".mp3")),
+                key=lambda i: i.filename,
+            )
+        count = len(mp3_infos)
+        if count == 0:
+            print(f"Book {book} ({code}): no MP3 files found")
+            return [f"{book}:no_mp3"]
+        # Fail fast on bad archives before any extract I/O: a truncated or
+        # partial download shows up as missing members or zero-size entries.
+        # Unlink so the next run re-downloads instead of re-failing.
+        if (expect_chapters > 0 and count != expect_chapters) or any(
+            i.file_size == 0 for i in mp3_infos
+        ):
+            print(f"Book {book} ({code}): bad zip (expected {expect_chapters} chapters, "
+                  f"found {count}); deleting for re-download")
+            zip_path.unlink(missing_ok=True)
+            return [f"{book}:bad_zip"]
+        members = [i.filename for i in mp3_infos]
+        with ThreadPoolExecutor(max_workers=min(8, count)) as pool:
+            futures = [
+                pool.submit(_extract_one, zip_path, member,
+                            chapters_dir / f"{book:03d}_{ch:03d}.mp3")
+                for ch, member in enumerate(members, 1)
+            ]
+            for fut in futures:
+                fut.result()
+    except zipfile.BadZipFile as e:
+        print(f"Book {book} ({code}): unzip FAILED ({e})")
+        return [f"{book}:unzip"]
+    print(f"Book {book} ({code}): -> {count} chapters written")
+    return []
+
+
 def main():
     parser = argparse.ArgumentParser(description="Download Everest Audio Bible and arrange by chapter")
     parser.add_argument("--dry-run", action="store_true", help="Show what would be done")
     parser.add_argument("--start", type=int, default=1, help="First book (1-66)")
     parser.add_argument("--end", type=int, default=66, help="Last book (1-66)")
+    parser.add_argument("--force", action="store_true", help="Re-extract books whose chapters already exist")
     args = parser.parse_args()
 
     repo_root = Path(__file__).resolve().parent.parent
     zips_dir = repo_root / "assets" / "bible" / "audio" / "zips"
     chapters_dir = repo_root / "assets" / "bible" / "audio" / "chapters"
-    temp_extract = repo_root / "assets" / "bible" / "audio" / ".tmp_extract"
-
     zips_dir.mkdir(parents=True, exist_ok=True)
     chapters_dir.mkdir(parents=True, exist_ok=True)
-    temp_extract.mkdir(parents=True, exist_ok=True)
 
     print("Everest Audio Bible download -> chapters")
     print(f"  Zips:      {zips_dir}")
@@ -61,78 +156,56 @@ def main():
         print("  (dry run - no downloads)")
     print()
 
-    failed = []
-
+    books: list[tuple[int, str, int]] = []
     for book in range(args.start, args.end + 1):
         if book >= len(EVEREST_CODES) or book < 1:
             continue
         code = EVEREST_CODES[book]
         expect_chapters = BOOK_CHAPTERS[book] if book < len(BOOK_CHAPTERS) else 0
-        zip_name = f"{code}.zip"
-        zip_path = zips_dir / zip_name
-
         if not code:
             print(f"Book {book}: skip (no code)")
             continue
-
         if args.dry_run:
             print(f"Book {book} ({code}): would download and extract ({expect_chapters} chapters)")
             continue
-
-        # Download if missing
-        if not zip_path.exists():
-            print(f"Book {book} ({code}): downloading... ", end="", flush=True)
+        # Resumability: a book whose chapter files are all present needs no work
+        if not args.force and expect_chapters > 0:
+            existing = len(list(chapters_dir.glob(f"{book:03d}_*.mp3")))
+            if existing == expect_chapters:
+                print(f"Book {book} ({code}): already complete ({existing} chapters), skip")
+                continue
+        books.append((book, code, expect_chapters))
+
+    failed: list[str] = []
+
+    # Pipeline: a new ZIP downloads while earlier ones extract, so per-book wall
+    # time approaches max(download, extract) instead of their sum. Downloads are
+    # capped at 4 to stay polite to the server; extraction scales with cores.
+    session = _make_session()
+    with ThreadPoolExecutor(max_workers=4) as downloads, \
+            ThreadPoolExecutor(max_workers=os.cpu_count() or 2) as extracts:
+        dl_futures = {
+            downloads.submit(download_book, session, book, code, zips_dir / f"{code}.zip"):
+                (book, code, expect)
+            for book, code, expect in books
+        }
+        extract_futures = []
+        for fut in as_completed(dl_futures):
+            book, code, expect = dl_futures[fut]
             try:
-                r = requests.get(f"{BASE_URL}/{zip_name}", timeout=120, stream=True)
-                r.raise_for_status()
-                with open(zip_path, "wb") as f:
-                    for chunk in r.iter_content(chunk_size=8192):
-                        f.write(chunk)
-                print("ok")
+                zip_path = fut.result()
             except requests.RequestException as e:
-                print(f"FAILED ({e})")
-                failed.append(f"{book}:{zip_name}")
-                if zip_path.exists():
-                    zip_path.unlink()
+                print(f"Book {book} ({code}): download FAILED ({e})")
+                failed.append(f"{book}:{code}.zip")
                 continue
-        else:
-            print(f"Book {book} ({code}): zip exists ", end="", flush=True)
-
-        # Extract and arrange
-        for f in temp_extract.iterdir():
-            if f.is_file():
-                f.unlink()
-            else:
-                shutil.rmtree(f)
-
-        try:
-            with zipfile.ZipFile(zip_path, "r") as zf:
-                zf.extractall(temp_extract)
-        except zipfile.BadZipFile as e:
-            print(f"  unzip FAILED ({e})")
-            failed.append(f"{book}:unzip")
-            continue
-
-        mp3s = sorted(temp_extract.rglob("*.mp3"))
-        count = len(mp3s)
-        if count == 0:
-            print("  no MP3 files found")
-            failed.append(f"{book}:no_mp3")
-            continue
-
-        if count != expect_chapters:
-            print(f"  WARNING: expected {expect_chapters} chapters, found {count}")
-
-        for ch, src in enumerate(mp3s, 1):
-            dest = chapters_dir / f"{book:03d}_{ch:03d}.mp3"
-            shutil.copy2(src, dest)
-        print(f"  -> {count} chapters written")
-
-    if temp_extract.exists():
-        shutil.rmtree(temp_extract, ignore_errors=True)
+            extract_futures.append(extracts.submit(
+                extract_book, book, code, zip_path, chapters_dir, expect
+            ))
+        for fut in as_completed(extract_futures):
+            failed.extend(fut.result())
 
     if failed:
-        print(f"\nFailed: {' '.join(failed)}")
+        print(f"\nFailed: {' '.join(sorted(failed))}")
         return 1
     print(f"\nDone. Chapter files in {chapters_dir}")
     return 0
@@ -17,17 +17,23 @@ Curated YouVersion (bible.com) plans (--youversion): M'Cheyne; Psalms & Proverbs
 Psalms+Proverbs in 31d; Bible in a Year (ABS); Bible in a Year (Ligonier OT+NT).
 """
 
-import json
 import re
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    from selectolax.parser import HTMLParser  # C HTML parser (optional)
+except ImportError:
+    HTMLParser = None
 
 # Add repo root
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
-from plan_utils import parse_day_text
+from plan_utils import BOOK_INDEX, parse_day_text, save_plan
 
 REPO_ROOT = Path(__file__).resolve().parent.parent
 PLANS_DIR = REPO_ROOT / "assets" / "bible" / "plans"
@@ -87,6 +93,25 @@ YOUVERSION_CURATED_PLANS: list[tuple[str, str, str, int]] = [
     ),
 ]
 
+# Hot-path patterns, compiled once at import instead of per call (the BST
+# parser runs per plan; the bible.com extractor runs once per crawled day page)
+_TAG_RE = re.compile(r"<[^>]+>")
+_DAY_RE = re.compile(r"Day\s+(\d+)\s+(.+?)(?=Day\s+\d+\s+|\Z)", re.DOTALL)
+_BIBLE_LINK_RE = re.compile(r"/bible/\d+/([A-Z0-9]+)\.(\d+)\.[A-Z]+", re.I)
+# The book-name alternations are generated from the shared name tables
+# (longest first so the engine takes the longest literal), not hand-kept
+# copies of all 66+ names. Both patterns are context-anchored — "[Name N]"
+# brackets and "/ABBR.N." link paths — which is why they stay single
+# anchored regexes rather than a bare multi-pattern scan over the page.
+_BRACKET_REF_RE = re.compile(
+    r"\[("
+    + "|".join(re.escape(n) for n in sorted(BOOK_INDEX, key=len, reverse=True))
+    + r")\s+(\d+)\]", re.I)
+_ABBR_LINK_RE = re.compile(
+    r"/("
+    + "|".join(sorted(BIBLE_COM_ABBR_TO_NUM, key=len, reverse=True))
+    + r")\.(\d+)\.", re.I)
+
 # Top 10 yearly plans from Bible Study Tools (fetchable)
 BST_YEARLY_PLANS = [
     (1, "chronological-1year", "Chronological Bible (1 Year)", "chronological.html"),
@@ -101,10 +126,16 @@ BST_YEARLY_PLANS = [
 
 def _parse_bst_days(html: str, max_day: int = 365) -> list[dict]:
     """Extract Day N / reading blocks from BST HTML."""
-    text = re.sub(r"<[^>]+>", " ", html)
-    text = " ".join(text.split())
+    body = HTMLParser(html).body if HTMLParser is not None else None
+    if body is not None:
+        # Single C pass: strips tags (including <script> bodies the regex
+        # would leak through) and collapses whitespace in one go
+        text = body.text(separator=" ", strip=True)
+    else:
+        text = _TAG_RE.sub(" ", html)
+        text = " ".join(text.split())
     entries = []
-    for m in re.finditer(r"Day\s+(\d+)\s+(.+?)(?=Day\s+\d+\s+|\Z)", text, re.DOTALL):
+    for m in _DAY_RE.finditer(text):
         day = int(m.group(1))
         if day > max_day:
             break
@@ -120,7 +151,7 @@ def chapters_from_bible_com_html(html: str) -> list[str]:
     Extract passage list from a bible.com plan day page. Prefer /bible/<vid>/<ABBR>.<ch>.<CODE>
     links (stable on current YouVersion web).
     """
-    pairs = re.findall(r"/bible/\d+/([A-Z0-9]+)\.(\d+)\.[A-Z]+", html, re.I)
+    pairs = _BIBLE_LINK_RE.findall(html)
     seen: set[tuple[str, str]] = set()
     out: list[str] = []
     for abbr, ch in pairs:
@@ -135,58 +166,50 @@ def chapters_from_bible_com_html(html: str) -> list[str]:
         out.append(f"{bnum}:{ch}")
     if out:
         return out
-    refs = re.findall(r"\[(Genesis|Exodus|Leviticus|Numbers|Deuteronomy|Joshua|"
-                      r"Judges|Ruth|1 Samuel|2 Samuel|1 Kings|2 Kings|1 Chronicles|2 Chronicles|"
-                      r"Ezra|Nehemiah|Esther|Job|Psalm|Psalms|Proverbs|Ecclesiastes|"
-                      r"Song of Solomon|Isaiah|Jeremiah|Lamentations|Ezekiel|Daniel|"
-                      r"Hosea|Joel|Amos|Obadiah|Jonah|Micah|Nahum|Habakkuk|Zephaniah|"
-                      r"Haggai|Zechariah|Malachi|Matthew|Mark|Luke|John|Acts|"
-                      r"Romans|1 Corinthians|2 Corinthians|Galatians|Ephesians|Philippians|"
-                      r"Colossians|1 Thessalonians|2 Thessalonians|1 Timothy|2 Timothy|"
-                      r"Titus|Philemon|Hebrews|James|1 Peter|2 Peter|1 John|2 John|3 John|"
-                      r"Jude|Revelation)\s+(\d+)\]", html, re.I)
+    refs = _BRACKET_REF_RE.findall(html)
     if refs:
         return parse_day_text("; ".join(f"{b} {c}" for b, c in refs))
-    refs2 = re.findall(
-        r"/(GEN|EXO|EXOD|LEV|NUM|DEUT|DEU|JOSH|JOS|JDG|RUTH|RUT|"
-        r"1SAM|1SA|2SAM|2SA|1KGS|1KI|2KGS|2KI|1CHR|1CH|2CHR|2CH|"
-        r"EZRA|EZR|NEH|ESTH|EST|JOB|PS|PSA|PROV|PRO|ECCL|ECC|SONG|SNG|"
-        r"ISA|JER|LAM|EZK|DAN|HOS|JOEL|JOL|AMOS|AMO|OBA|JON|MIC|NAH|NAM|HAB|ZEP|HAG|ZEC|MAL|"
-        r"MATT|MAT|MARK|MRK|LUKE|LUK|LKE|JOHN|JHN|ACTS|ACT|ROM|"
-        r"1CO|2CO|GAL|EPH|PHP|COL|1TH|2TH|1TI|2TI|TIT|PHM|HEB|JAS|"
-        r"1PE|2PE|1JN|2JN|3JN|JUDE|JUD|REV)\.(\d+)\.",
-        html, re.I
-    )
+    refs2 = _ABBR_LINK_RE.findall(html)
     return [f"{BIBLE_COM_ABBR_TO_NUM[a.upper()]}:{c}" for a, c in refs2
             if a.upper() in BIBLE_COM_ABBR_TO_NUM]
 
 
+def _fetch_day_html(session: requests.Session, base_url: str, day: int) -> str | None:
+    """Fetch one plan day page with retry. Returns None after three failures."""
+    url = f"{base_url}/day/{day}"
+    for attempt in range(3):
+        try:
+            r = session.get(url, timeout=45, headers=BIBLE_COM_HEADERS)
+            r.raise_for_status()
+            return r.text
+        except requests.RequestException as e:
+            if attempt < 2:
+                time.sleep(2 * (attempt + 1))
+            else:
+                print(f"\n  Day {day}: fetch failed ({e}), using empty")
+    return None
+
+
 def fetch_bible_com_plan(plan_slug: str, plan_id: str, name: str, total_days: int) -> dict:
-    """Fetch one YouVersion / bible.com plan by crawling each day page."""
+    """Fetch one YouVersion / bible.com plan by crawling each day page.
+
+    Day pages download concurrently over one keep-alive session (the serial
+    crawl spent ~an RTT per day); parsing stays sequential and entries come
+    out in day order.
+    """
     base_url = f"https://www.bible.com/reading-plans/{plan_slug}"
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
     entries: list[dict] = []
-    for day in range(1, total_days + 1):
-        url = f"{base_url}/day/{day}"
-        html = None
-        for attempt in range(3):
-            try:
-                r = requests.get(url, timeout=45, headers=BIBLE_COM_HEADERS)
-                r.raise_for_status()
-                html = r.text
-                break
-            except requests.RequestException as e:
-                if attempt < 2:
-                    time.sleep(2 * (attempt + 1))
-                else:
-                    print(f"\n  Day {day}: fetch failed ({e}), using empty")
-                    entries.append({"day": day, "chapters": []})
-                    break
-        if html is None:
-            continue
-        chapters = chapters_from_bible_com_html(html)
-        entries.append({"day": day, "chapters": chapters})
-        print(f"  Day {day}/{total_days}: {len(chapters)} chapters", end="\r")
-        time.sleep(0.12)
+    with ThreadPoolExecutor(max_workers=16) as ex:
+        htmls = ex.map(
+            lambda day: _fetch_day_html(session, base_url, day),
+            range(1, total_days + 1),
+        )
+        for day, html in enumerate(htmls, 1):
+            chapters = chapters_from_bible_com_html(html) if html is not None else []
+            entries.append({"day": day, "chapters": chapters})
+            print(f"  Day {day}/{total_days}: {len(chapters)} chapters", end="\r")
     print()
     return {
         "id": plan_id,
@@ -197,10 +220,11 @@ def fetch_bible_com_plan(plan_slug: str, plan_id: str, name: str, total_days: in
     }
 
 
-def fetch_bst_plan(plan_id: str, name: str, slug: str) -> dict:
-    """Fetch any BST yearly plan by slug."""
+def fetch_bst_plan(plan_id: str, name: str, slug: str,
+                   session: requests.Session | None = None) -> dict:
+    """Fetch any BST yearly plan by slug (optionally over a shared session)."""
     url = f"https://www.biblestudytools.com/bible-reading-plan/{slug}"
-    r = requests.get(url, timeout=30)
+    r = (session or requests).get(url, timeout=30)
     r.raise_for_status()
     entries = _parse_bst_days(r.text)
     return {
@@ -270,12 +294,23 @@ def main():
     PLANS_DIR.mkdir(parents=True, exist_ok=True)
 
     if args.all or args.yearly:
-        for rank, plan_id, name, slug in BST_YEARLY_PLANS:
-            print(f"Fetching #{rank} {name}...")
+        # The 7 BST pages download concurrently over one keep-alive session
+        # (the serial loop paid a TLS handshake + full RTT per plan); results
+        # are saved in rank order regardless of completion order.
+        print(f"Fetching {len(BST_YEARLY_PLANS)} BST yearly plans concurrently...")
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=8))
+        with ThreadPoolExecutor(max_workers=len(BST_YEARLY_PLANS)) as ex:
+            futures = [
+                ex.submit(fetch_bst_plan, plan_id, name, slug, session)
+                for _rank, plan_id, name, slug in BST_YEARLY_PLANS
+            ]
+        for (rank, plan_id, name, _slug), fut in zip(BST_YEARLY_PLANS, futures):
+            print(f"#{rank} {name}:")
             try:
-                p = fetch_bst_plan(plan_id, name, slug)
+                p = fut.result()
                 out = PLANS_DIR / f"{plan_id}.json"
-                out.write_text(json.dumps(p, indent=2, ensure_ascii=False))
+                save_plan(p, out)
                 print(f"  Saved {len(p['entries'])} days -> {out.name}")
             except Exception as e:
                 print(f"  Failed: {e}")
@@ -284,13 +319,13 @@ def main():
         print("Fetching Ninety-Day Challenge...")
         p2 = fetch_bst_ninety_day()
         out2 = PLANS_DIR / "ninety-day-challenge.json"
-        out2.write_text(json.dumps(p2, indent=2, ensure_ascii=False))
+        save_plan(p2, out2)
         print(f"  Saved {len(p2['entries'])} days -> {out2.name}")
 
         print("Fetching Chronological in 90 Days (bible.com, 90 pages)...")
         p3 = fetch_bible_com_chronological_90()
         out3 = PLANS_DIR / "chronological-90days.json"
-        out3.write_text(json.dumps(p3, indent=2, ensure_ascii=False))
+        save_plan(p3, out3)
         print(f"  Saved {len(p3['entries'])} days -> {out3.name}")
 
     if args.youversion:
@@ -299,7 +334,7 @@ def main():
             try:
                 p = fetch_bible_com_plan(slug, json_id, title, n_days)
                 out = PLANS_DIR / f"{json_id}.json"
-                out.write_text(json.dumps(p, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+                save_plan(p, out)
                 nonempty = sum(1 for e in p["entries"] if e.get("chapters"))
                 print(f"  Saved {len(p['entries'])} days ({nonempty} with passages) -> {out.name}")
             except Exception as e:
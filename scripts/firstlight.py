@@ -18,6 +18,7 @@ Usage:
 import argparse
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timedelta
 from pathlib import Path
 
@@ -108,8 +109,12 @@ def main():
         return 1
 
     plan = load_plan(plan_path)
-    max_day = max(e["day"] for e in plan["entries"])
-    entries_by_day = {e["day"]: e for e in plan["entries"]}
+    entries = plan["entries"]
+    max_day = entries[-1]["day"]  # entries are day-sorted
+    # Direct index by day number (days are dense 1..max_day; gaps stay None)
+    by_day: list[dict | None] = [None] * (max_day + 1)
+    for e in entries:
+        by_day[e["day"]] = e
 
     out_dir = Path(args.output) if args.output else REPO_ROOT / "audio" / args.plan
     out_dir.mkdir(parents=True, exist_ok=True)
@@ -118,14 +123,15 @@ def main():
 
     # Collect valid days in range (skip days with empty chapters – plan has gaps)
     days_to_generate = []
-    d = start_date
-    while d <= end_date:
-        day_num = (d - plan_start).days + 1
+    offset0 = (start_date - plan_start).days + 1  # plan day number of start_date
+    for i in range((end_date - start_date).days + 1):
+        day_num = offset0 + i
         if 1 <= day_num <= max_day:
-            entry = entries_by_day.get(day_num)
+            entry = by_day[day_num]
             if entry and entry.get("chapters"):
-                days_to_generate.append((d, day_num, entry["chapters"]))
-        d += timedelta(days=1)
+                days_to_generate.append(
+                    (start_date + timedelta(days=i), day_num, entry["chapters"])
+                )
 
     if not days_to_generate:
         first_d = start_date
@@ -139,7 +145,7 @@ def main():
             print(f"Day {day_num_first} ({first_d}) has no chapters in the plan (plan has gaps).")
             # Suggest next date with content
             for dn in range(day_num_first + 1, max_day + 1):
-                if entries_by_day.get(dn, {}).get("chapters"):
+                if by_day[dn] and by_day[dn].get("chapters"):
                     next_d = plan_start + timedelta(days=dn - 1)
                     print(f"  Next day with content: Day {dn} ({next_d}). Try: --start-date {next_d}")
                     break
@@ -166,7 +172,7 @@ def main():
     print("\n" + "=" * 60, flush=True)
     print("Generating MP3 files...", flush=True)
     print("=" * 60, flush=True)
-    for d, day_num, chapters in days_to_generate:
+    def render_day(day_num: int) -> list[str]:
         base = [
             sys.executable, str(generate),
             args.plan,
@@ -180,18 +186,31 @@ def main():
             base.append("--use-tts")
         if args.chapter_voice:
             base.extend(["--chapter-voice", args.chapter_voice])
-        done = []
+        cmds: list[tuple[str, list[str]]] = []
         if preset in (1, 2, 3):
-            subprocess.run(base + ["--speed", "1"], check=True)
-            done.append("plain")
+            cmds.append(("plain", base + ["--speed", "1"]))
         if preset in (2, 3):
-            subprocess.run(base + ["--speed", "1", "--bgm", "--bgm-splits", "3"], check=True)
-            done.append("原速(3)")
+            cmds.append(("原速(3)", base + ["--speed", "1", "--bgm", "--bgm-splits", "3"]))
         if preset in (1, 3):
-            subprocess.run(base + ["--speed", "1.5", "--bgm", "--bgm-splits", "2"], check=True)
-            subprocess.run(base + ["--speed", "2", "--bgm", "--bgm-splits", "1"], check=True)
-            done.extend(["加速(2)", "倍速"])
-        print(f"✅ Day {day_num}: {' + '.join(done)}", flush=True)
+            cmds.append(("加速(2)", base + ["--speed", "1.5", "--bgm", "--bgm-splits", "2"]))
+            cmds.append(("倍速", base + ["--speed", "2", "--bgm", "--bgm-splits", "1"]))
+        # The preset's renders write independent files; run them concurrently
+        # instead of paying interpreter startup + plan load serially per file
+        procs = [(label, subprocess.Popen(cmd)) for label, cmd in cmds]
+        done = []
+        for label, proc in procs:
+            if proc.wait() != 0:
+                raise subprocess.CalledProcessError(proc.returncode, proc.args)
+            done.append(label)
+        return done
+
+    # Days are independent too: render a few at once (each day already forks
+    # several ffmpeg-heavy children, so the day-level fanout stays small).
+    # ex.map keeps the ✅ log in date order regardless of completion order.
+    with ThreadPoolExecutor(max_workers=min(4, len(days_to_generate))) as ex:
+        results = ex.map(render_day, [day_num for _, day_num, _ in days_to_generate])
+        for (d, day_num, _), done in zip(days_to_generate, results):
+            print(f"✅ Day {day_num}: {' + '.join(done)}", flush=True)
 
     print(f"\nDone. Output: {out_dir}")
     return 0
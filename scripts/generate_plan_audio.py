@@ -19,15 +19,23 @@ Usage:
 """
 
 import argparse
-import json
+import contextlib
+import io
+import os
+import shlex
 import subprocess
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import date, timedelta
+from multiprocessing import shared_memory
 from pathlib import Path
 
 REPO_ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(REPO_ROOT))
-from plan_utils import chapters_to_filename, BOOK_FILENAME_ABBR_ZH_TW
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+from plan_utils import chapters_to_filename, load_plan, BOOK_FILENAME_ABBR_ZH_TW
+import audio_mixer
+import concat_daily
 
 # plan_id -> Chinese name pattern ({i} = day index; use :02d in format spec if desired)
 PLAN_FILENAME = {
@@ -96,6 +104,93 @@ def get_bgm_suffix(speed: float, part_index: int, total_parts: int) -> str:
     return f"{label}{part_index + 1}"
 
 
+def _publish_shared_bgm(bgm_dir: Path) -> tuple[list[tuple], list]:
+    """Decode + normalize each BGM track once and publish its PCM in shared memory.
+
+    Workers attach instead of re-decoding, so N workers share one PCM copy
+    rather than holding N. Returns (meta for the worker initializer, shm
+    blocks for the caller to unlink once the pool is done).
+    """
+    meta, blocks = [], []
+    try:
+        names = audio_mixer._bgm_files(str(bgm_dir), os.stat(bgm_dir).st_mtime_ns)
+    except OSError:
+        return [], []
+    for name in names:
+        path = str(bgm_dir / name)
+        try:
+            seg = audio_mixer._load_and_normalize(path)
+        except Exception as e:
+            print(f"❌ Error loading BGM {name}: {e}")
+            continue
+        raw = seg.raw_data
+        shm = shared_memory.SharedMemory(create=True, size=len(raw))
+        shm.buf[: len(raw)] = raw
+        blocks.append(shm)
+        meta.append((path, shm.name, len(raw),
+                     seg.frame_rate, seg.channels, seg.sample_width))
+    return meta, blocks
+
+
+_ATTACHED_SHM: list = []  # keeps worker-side mappings alive for the process
+
+
+def _attach_shared_bgm(meta: list[tuple]) -> None:
+    """Pool initializer: map the parent's normalized BGM PCM without copying.
+
+    nbytes slicing matters — the OS rounds shared blocks up to page size,
+    and trailing padding would otherwise play as garbage samples.
+    """
+    for path, shm_name, nbytes, rate, channels, width in meta:
+        try:
+            try:
+                shm = shared_memory.SharedMemory(name=shm_name, track=False)
+            except TypeError:  # track= is 3.13+
+                shm = shared_memory.SharedMemory(name=shm_name)
+        except FileNotFoundError:
+            continue
+        _ATTACHED_SHM.append(shm)
+        audio_mixer.seed_bgm(path, shm.buf[:nbytes], rate, channels, width)
+
+
+def _render_job(job: tuple[int, list[list[str]], list[str], bool]) -> str:
+    """Pool worker: render one day's output files (module-level so it pickles).
+
+    A day's --bgm-splits parts run sequentially inside one worker: they pull
+    from the same chapter set, so concurrent workers could race the same
+    on-the-fly TTS generation, and the parts after the first hit the warm
+    decode cache anyway. Default path calls concat_daily.run in-process: no
+    interpreter startup or pydub re-import per day, and a worker's
+    decoded-chapter/BGM caches carry over between its jobs. --isolate keeps
+    the old subprocess per render. Progress output is captured rather than
+    streamed — concat_daily's lines interleave unreadably across workers —
+    but its ⚠️/❌ warning lines (missing chapters, fallbacks) are replayed
+    with each part's summary line, and the full capture goes to stderr when
+    a render fails.
+    """
+    day, argvs, out_names, isolate = job
+    lines: list[str] = []
+    for argv, out_name in zip(argvs, out_names):
+        if isolate:
+            proc = subprocess.run([sys.executable, str(CONCAT_SCRIPT), *argv],
+                                  stdout=subprocess.PIPE, text=True)
+            captured = proc.stdout
+            rc = proc.returncode
+        else:
+            args = concat_daily.build_parser().parse_args(argv)
+            buf = io.StringIO()
+            with contextlib.redirect_stdout(buf):
+                rc = concat_daily.run(args)
+            captured = buf.getvalue()
+        if rc != 0:
+            sys.stderr.write(captured)
+            raise RuntimeError(f"Day {day}: concat_daily failed (exit {rc})")
+        lines.extend(ln for ln in captured.splitlines()
+                     if ln.startswith(("⚠️", "❌")))
+        lines.append(f"Day {day}: {out_name}")
+    return "\n".join(lines)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description=(
@@ -161,6 +256,46 @@ def main():
         metavar="N",
         help="For duplicate_random: reproducible per-chapter order (omit = random)",
     )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help=(
+            "Print one shell-quoted concat_daily command per job and exit. "
+            "Lets an external scheduler drive the encoding, e.g. "
+            "... --dry-run | parallel -j 8 --bar --joblog run.log --resume-failed"
+        ),
+    )
+    parser.add_argument(
+        "--isolate",
+        action="store_true",
+        help="Run each day in a separate Python process (slower; for debugging)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-render outputs that already exist (default: skip them)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Concurrent day renders (default: CPU count; capped at 4 with --bgm)",
+    )
+    parser.add_argument(
+        "--mp3-quality",
+        type=int,
+        default=None,
+        metavar="Q",
+        help="LAME VBR quality 0-9 passed to concat_daily (-q:a 4 ≈ 192k CBR); default: 320k CBR",
+    )
+    parser.add_argument(
+        "--mp3-compression",
+        type=int,
+        default=None,
+        metavar="N",
+        help="LAME speed knob (-compression_level) 0=slow/best..9=fast passed to concat_daily",
+    )
     parser.add_argument("--bgm-splits", type=int, default=1,
                         help="Split BGM output into N files (1x->3, 1.5x->2, 2x->1)")
     parser.add_argument("--start-date", type=str, default="2026-02-17",
@@ -193,7 +328,7 @@ def main():
         print(f"Available: {[p.stem for p in PLANS_DIR.glob('*.json')]}")
         return 1
 
-    plan = json.loads(plan_path.read_text())
+    plan = load_plan(plan_path)
     entries = plan["entries"]
     out_dir = Path(args.output)
     out_dir.mkdir(parents=True, exist_ok=True)
@@ -204,15 +339,45 @@ def main():
     start = args.start_day
     end = args.end_day or max(e["day"] for e in entries)
 
+    # Filename date prefixes for days 1..end, computed once up front —
+    # strftime re-parses its format string per call, which adds up over a
+    # 365-entry loop.
+    date_prefix = [
+        (start_date + timedelta(days=i)).strftime("%Y%m%d") for i in range(end)
+    ]
+
+    # Same treatment for the day names: str.format re-parses its template on
+    # every call. Split name_fmt around its single {i}/{i:02d} placeholder
+    # once, then fill in the day with an f-string.
+    left, sep, rest = name_fmt.partition("{i")
+    spec, _, right = rest.partition("}")
+    day_name = [
+        f"{left}{format(d, spec.lstrip(':'))}{right}" if sep else name_fmt
+        for d in range(1, end + 1)
+    ]
+
+    # Filter down to the renderable entries in one pass, then build jobs —
+    # keeps the render loop free of range/emptiness checks and lets the log
+    # say up front how much work is queued.
+    work: list[dict] = []
     for entry in entries:
         day = entry["day"]
-        if day < start or day > end:
+        if day > end:
+            break  # entries are day-sorted; nothing further is in range
+        if day < start:
             continue
-        chapters = entry.get("chapters", [])
-        if not chapters:
+        if not entry.get("chapters"):
             print(f"Day {day}: skip (no chapters)")
             continue
-        d = start_date + timedelta(days=day - 1)
+        work.append(entry)
+
+    # Build the full job list first (cheap, pure Python); the encoding work
+    # happens in the pool below, where independent days run concurrently.
+    # One job per day — a day's split parts stay together (see _render_job).
+    jobs: list[tuple[int, list[list[str]], list[str], bool]] = []
+    for entry in work:
+        day = entry["day"]
+        chapters = entry["chapters"]
         _ch_join = "-"
         if args.plan_id in WISDOM_PRAISE_STYLE_PLANS:
             label = wisdom_praise_filename_label(plan_days, day, args.chapter_voice)
@@ -222,22 +387,24 @@ def main():
                 )
                 base_name = f"{label}-{ch_str}"
             else:
-                prefix = d.strftime("%Y%m%d")  # YYYYMMDD
+                prefix = date_prefix[day - 1]  # YYYYMMDD
                 base_name = f"{prefix}-{label}"
         elif args.use_chapter_filename:
             ch_str = chapters_to_filename(
                 chapters, abbr=BOOK_FILENAME_ABBR_ZH_TW, between_groups=_ch_join
             )
-            base_name = f"{name_fmt.format(i=day)}-{ch_str}"
+            base_name = f"{day_name[day - 1]}-{ch_str}"
         else:
-            prefix = d.strftime("%Y%m%d")  # YYYYMMDD
-            base_name = f"{prefix}-{name_fmt.format(i=day)}"
+            prefix = date_prefix[day - 1]  # YYYYMMDD
+            base_name = f"{prefix}-{day_name[day - 1]}"
         if args.filename_suffix:
             base_name += args.filename_suffix
 
         if args.bgm:
             splits = args.bgm_splits
             groups = split_chapters(chapters, splits)
+            day_argvs: list[list[str]] = []
+            day_names: list[str] = []
             for i, group in enumerate(groups):
                 spec = ",".join(group)
                 suffix = get_bgm_suffix(args.speed, i, splits)
@@ -245,55 +412,113 @@ def main():
                     out_file = out_dir / f"{base_name}.mp3"
                 else:
                     out_file = out_dir / f"{base_name}_{suffix}.mp3"
-                cmd = [
-                    sys.executable, str(CONCAT_SCRIPT),
+                # Re-runs after a partial failure only pay for missing days;
+                # zero-size leftovers from a killed encode don't count
+                if not args.force and out_file.exists() and out_file.stat().st_size > 0:
+                    print(f"Day {day}: skip (exists) {out_file.name}")
+                    continue
+                argv = [
                     "-c", spec,
                     "-o", str(out_file),
                     "--speech-volume", str(args.speech_volume),
                     "--bgm", "--bgm-volume", str(args.bgm_volume),
                 ]
                 if args.speed > 1.0:
-                    cmd.extend(["--speed", str(args.speed)])
+                    argv.extend(["--speed", str(args.speed)])
                 if args.use_tts:
-                    cmd.append("--use-tts")
+                    argv.append("--use-tts")
                 if args.interleave_tts:
-                    cmd.append("--interleave-tts")
+                    argv.append("--interleave-tts")
                 if args.compare:
-                    cmd.append("--compare")
-                    cmd.extend(["--trans", args.trans])
+                    argv.append("--compare")
+                    argv.extend(["--trans", args.trans])
                 if args.chapter_voice:
-                    cmd.extend(["--chapter-voice", args.chapter_voice])
-                    cmd.extend(["--voice-rotation-start", str(day)])
+                    argv.extend(["--chapter-voice", args.chapter_voice])
+                    argv.extend(["--voice-rotation-start", str(day)])
                 if args.duplicate_random_seed is not None:
-                    cmd.extend(["--duplicate-random-seed", str(args.duplicate_random_seed)])
-                subprocess.run(cmd, check=True)
-                print(f"Day {day}: {out_file.name}")
+                    argv.extend(["--duplicate-random-seed", str(args.duplicate_random_seed)])
+                if args.mp3_quality is not None:
+                    argv.extend(["--mp3-quality", str(args.mp3_quality)])
+                if args.mp3_compression is not None:
+                    argv.extend(["--mp3-compression", str(args.mp3_compression)])
+                day_argvs.append(argv)
+                day_names.append(out_file.name)
+            if day_argvs:
+                jobs.append((day, day_argvs, day_names, args.isolate))
         else:
             # Plain: 1x only, no suffix
             spec = ",".join(chapters)
             out_file = out_dir / f"{base_name}.mp3"
-            cmd = [
-                sys.executable, str(CONCAT_SCRIPT),
+            if not args.force and out_file.exists() and out_file.stat().st_size > 0:
+                print(f"Day {day}: skip (exists) {out_file.name}")
+                continue
+            argv = [
                 "-c", spec,
                 "-o", str(out_file),
                 "--speech-volume", str(args.speech_volume),
             ]
             if args.speed > 1.0:
-                cmd.extend(["--speed", str(args.speed)])
+                argv.extend(["--speed", str(args.speed)])
             if args.use_tts:
-                cmd.append("--use-tts")
+                argv.append("--use-tts")
             if args.interleave_tts:
-                cmd.append("--interleave-tts")
+                argv.append("--interleave-tts")
             if args.compare:
-                cmd.append("--compare")
-                cmd.extend(["--trans", args.trans])
+                argv.append("--compare")
+                argv.extend(["--trans", args.trans])
             if args.chapter_voice:
-                cmd.extend(["--chapter-voice", args.chapter_voice])
-                cmd.extend(["--voice-rotation-start", str(day)])
+                argv.extend(["--chapter-voice", args.chapter_voice])
+                argv.extend(["--voice-rotation-start", str(day)])
             if args.duplicate_random_seed is not None:
-                cmd.extend(["--duplicate-random-seed", str(args.duplicate_random_seed)])
-            subprocess.run(cmd, check=True)
-            print(f"Day {day}: {out_file.name}")
+                argv.extend(["--duplicate-random-seed", str(args.duplicate_random_seed)])
+            if args.mp3_quality is not None:
+                argv.extend(["--mp3-quality", str(args.mp3_quality)])
+            if args.mp3_compression is not None:
+                argv.extend(["--mp3-compression", str(args.mp3_compression)])
+            jobs.append((day, [argv], [out_file.name], args.isolate))
+
+    if args.dry_run:
+        for _day, argvs, _out_names, _isolate in jobs:
+            for argv in argvs:
+                print(shlex.join([sys.executable, str(CONCAT_SCRIPT), *argv]))
+        return 0
+
+    if jobs:
+        renders = sum(len(argvs) for _, argvs, _, _ in jobs)
+        print(f"{renders} renders queued ({len(work)} days in range)")
+
+    # MP3 encoding dominates each job and days are independent, so wall time
+    # divides by the worker count. BGM mixing holds whole decoded days in
+    # RAM, so its default fanout stays small.
+    workers = args.jobs or os.cpu_count() or 1
+    if args.bgm and args.jobs is None:
+        workers = min(workers, 4)
+    workers = max(1, min(workers, len(jobs) or 1))
+    if workers == 1:
+        for job in jobs:
+            print(_render_job(job))
+    else:
+        # With --bgm, the parent decodes + normalizes the track set once and
+        # publishes the PCM in shared memory; workers map it read-only, so
+        # one copy serves the whole pool. If publishing fails, workers fall
+        # back to warming their own caches at startup.
+        init, initargs, shm_blocks = None, (), []
+        if args.bgm and not args.isolate:
+            meta, shm_blocks = _publish_shared_bgm(REPO_ROOT / "assets" / "bgm")
+            if meta:
+                init, initargs = _attach_shared_bgm, (meta,)
+            else:
+                init = audio_mixer.preload_bgm
+                initargs = (str(REPO_ROOT / "assets" / "bgm"),)
+        try:
+            with ProcessPoolExecutor(max_workers=workers,
+                                     initializer=init, initargs=initargs) as ex:
+                for line in ex.map(_render_job, jobs):
+                    print(line, flush=True)
+        finally:
+            for shm in shm_blocks:
+                shm.close()
+                shm.unlink()
 
     print(f"Done. Output: {out_dir}")
     return 0
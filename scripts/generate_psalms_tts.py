@@ -68,7 +68,15 @@ def get_out_dir(translation: str) -> Path:
 async def generate_chapter_audio(book_num, chapter_num, text, out_file, voice):
     print(f"Generating {out_file.name} [{voice}] (length: {len(text)} chars)...")
     communicate = edge_tts.Communicate(text=text, voice=voice, rate=RATE)
-    await communicate.save(str(out_file))
+    # Stream to a temp file and rename into place: concurrent renders poll
+    # out_file.exists() as their cache check, and edge-tts takes seconds per
+    # chapter — a direct save would expose a half-written file that whole time.
+    tmp_file = out_file.with_suffix(f".tmp{os.getpid()}.mp3")
+    try:
+        await communicate.save(str(tmp_file))
+        os.replace(tmp_file, out_file)
+    finally:
+        tmp_file.unlink(missing_ok=True)
 
 def main():
     parser = argparse.ArgumentParser(
@@ -16,10 +16,83 @@ from pathlib import Path
 
 from pydub import AudioSegment
 
+try:
+    import numpy as np
+    from pedalboard.io import AudioFile  # in-process C++ MP3 encoder (optional)
+except ImportError:
+    AudioFile = None
+
+try:
+    import av  # in-process decoder (optional)
+except ImportError:
+    av = None
+
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 import audio_mixer
 
 
+def _load_audio(inp: Path) -> AudioSegment:
+    """Decode the input via PyAV when available, else pydub.
+
+    pydub's from_file spawns ffmpeg and roundtrips a temporary WAV through
+    disk; PyAV decodes straight into memory. Either way the result is the
+    same 16-bit interleaved AudioSegment that audio_mixer expects.
+    """
+    if av is None:
+        return AudioSegment.from_file(str(inp))
+    with av.open(str(inp)) as container:
+        stream = container.streams.audio[0]
+        rate = stream.rate
+        channels = len(stream.layout.channels)
+        resampler = av.AudioResampler(format="s16", layout=stream.layout, rate=rate)
+        # to_ndarray() trims to the valid samples (plane buffers carry
+        # alignment padding that would stretch the audio with silence)
+        chunks = [
+            out_frame.to_ndarray().tobytes()
+            for frame in container.decode(stream)
+            for out_frame in resampler.resample(frame)
+        ]
+        chunks.extend(f.to_ndarray().tobytes() for f in resampler.resample(None))
+    return AudioSegment(
+        data=b"".join(chunks), sample_width=2, frame_rate=rate, channels=channels
+    )
+
+
+def _export_mp3(mixed: AudioSegment, out: str, bitrate: str = "192k",
+                vbr_quality: int | None = None,
+                compression_level: int | None = None) -> None:
+    """Write MP3 via pedalboard when available, else pydub's ffmpeg export.
+
+    pydub's export shells out to ffmpeg through a tempfile + pipe roundtrip
+    per file; pedalboard encodes in-process (and releases the GIL, so batch
+    callers can thread over many files). Output format is the same either way.
+    vbr_quality selects LAME VBR -V0..-V9 instead of CBR at bitrate;
+    compression_level maps to LAME -q (encode speed knob, ffmpeg path only).
+    """
+    if AudioFile is not None and mixed.sample_width == 2 and compression_level is None:
+        samples = (
+            np.frombuffer(mixed.raw_data, dtype=np.int16)
+            .reshape(-1, mixed.channels)
+            .T.astype(np.float32)
+            / 32768.0
+        )
+        quality = (f"V{vbr_quality}" if vbr_quality is not None
+                   else int(bitrate.rstrip("k")))
+        with AudioFile(out, "w", samplerate=mixed.frame_rate,
+                       num_channels=mixed.channels, quality=quality) as f:
+            f.write(samples)
+        return
+    params = []
+    if vbr_quality is not None:
+        params += ["-q:a", str(vbr_quality)]
+    if compression_level is not None:
+        params += ["-compression_level", str(compression_level)]
+    if vbr_quality is not None:
+        mixed.export(out, format="mp3", parameters=params)
+    else:
+        mixed.export(out, format="mp3", bitrate=bitrate, parameters=params or None)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Mix existing audio with background music",
@@ -40,6 +113,20 @@ Examples:
     parser.add_argument("--bgm-intro", type=int, default=4000, help="BGM intro delay (ms)")
     parser.add_argument("--bgm-tail", type=int, default=3000, help="BGM tail (ms)")
     parser.add_argument("--speech-volume", type=int, default=0, help="Speech volume in dB")
+    parser.add_argument(
+        "--mp3-quality",
+        type=int,
+        default=None,
+        metavar="Q",
+        help="LAME VBR quality 0-9 (-q:a 4 ≈ 165kbps VBR ≈ 192k CBR); default: 192k CBR",
+    )
+    parser.add_argument(
+        "--mp3-compression",
+        type=int,
+        default=None,
+        metavar="N",
+        help="ffmpeg -compression_level (LAME -q) 0=slow/best..9=fast; default: encoder default",
+    )
 
     args = parser.parse_args()
 
@@ -56,7 +143,7 @@ Examples:
     repo_root = Path(__file__).resolve().parent.parent
     bgm_dir = repo_root / args.bgm_dir
 
-    speech = AudioSegment.from_file(str(inp))
+    speech = _load_audio(inp)
 
     if args.bgm:
         mixed = audio_mixer.mix_bgm(
@@ -74,7 +161,8 @@ Examples:
         else:
             mixed = speech
 
-    mixed.export(out, format="mp3", bitrate="192k")
+    _export_mp3(mixed, out, vbr_quality=args.mp3_quality,
+                compression_level=args.mp3_compression)
     print(f"✅ Saved: {out}")
     return 0
 
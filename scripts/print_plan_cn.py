@@ -23,9 +23,11 @@ def main():
     plan_name_cn = {"chronological-1year": "历史读经", "chronological-90days": "90天历史读经"}.get(plan_id, plan["name"])
     print(f"【{plan_name_cn}】开始日期：{start_date}\n")
 
-    for entry in plan["entries"][:max_days]:
+    entries = plan["entries"][:max_days]
+    # Display dates computed once up front rather than per loop iteration
+    dates = [start_date + timedelta(days=e["day"] - 1) for e in entries]
+    for entry, d in zip(entries, dates):
         day = entry["day"]
-        d = start_date + timedelta(days=day - 1)
         chapters = entry.get("chapters", [])
         cn = chapters_to_chinese(chapters, BOOK_CHINESE)
         print(f"第{day}天（{d}）：{cn}\n")